@@ -2,27 +2,68 @@
 ImaraFund API Endpoints
 RESTful API for grant matching with comprehensive filtering
 """
-from app.schemas import GrantResponse, GrantCreate
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.models import Grant, Company
-from app.schemas import GrantCreate
 from app.schemas import (
-    GrantResponse, CompanyResponse, CompanyCreate, MatchResponse,
+    GrantResponse, GrantCreate, CompanyResponse, CompanyCreate, MatchResponse,
     ScoreBreakdown, MatchResult
 )
 from app.services.intelligent_matcher import IntelligentMatcher
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import GeminiService, get_gemini_service
+from app.utils.like import apply_text_filter, like_criterion
+from app.utils.sector_index import sector_index_criterion
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 router = APIRouter()
 
 
+def serialize_rows(models):
+    """
+    Render a list endpoint response
+
+    With orjson installed the pre-built models are serialized directly via
+    ORJSONResponse, skipping FastAPI's per-element response_model
+    re-validation; otherwise fall back to the standard path.
+    """
+    if ORJSON_AVAILABLE:
+        return ORJSONResponse([model.model_dump() for model in models])
+    return models
+
+# Only the columns the response schemas actually serialize - the list
+# endpoints project these instead of hydrating full ~60-column ORM objects
+GRANT_RESPONSE_COLS = (
+    Grant.id, Grant.program_id, Grant.program_name, Grant.institution_name,
+    Grant.country, Grant.region, Grant.geographic_scope, Grant.repayment_required,
+    Grant.program_type, Grant.target_sectors, Grant.estimated_value_amount,
+    Grant.website_url, Grant.data_source_url, Grant.women_focused,
+    Grant.youth_focused, Grant.agriculture_focused, Grant.verified, Grant.created_at,
+)
+
+COMPANY_RESPONSE_COLS = (
+    Company.id, Company.company_id, Company.company_name, Company.sector,
+    Company.nationality, Company.business_stage, Company.funding_need_usd,
+    Company.founder_age, Company.business_age_months, Company.annual_revenue_usd,
+    Company.employees, Company.created_at,
+)
+
+
 @router.get("/grants", response_model=List[GrantResponse])
 def list_grants(
-    sector: Optional[str] = Query(None, description="Filter by target sector"),
-    country: Optional[str] = Query(None, description="Filter by country"),
+    sector: Optional[str] = Query(None, description="Filter by target sector (exact, or % wildcards)"),
+    country: Optional[str] = Query(None, description="Filter by country (exact, or % wildcards)"),
+    contains: Optional[str] = Query(None, description="Substring match against target sectors"),
     repayment_required: Optional[bool] = Query(None, description="Filter by repayment requirement"),
     min_amount: Optional[float] = Query(None, description="Minimum grant amount"),
     max_amount: Optional[float] = Query(None, description="Maximum grant amount"),
@@ -35,16 +76,27 @@ def list_grants(
     db: Session = Depends(get_db)
 ):
     """List grants with comprehensive filtering based on your CSV structure"""
-    query = db.query(Grant)
+    query = select(*GRANT_RESPONSE_COLS)
 
-    # Apply filters
+    # Apply filters - each term is specialized to the cheapest operator
+    # (=, prefix LIKE, ILIKE) so the pattern indexes in models.py can serve it
     if sector:
-        query = query.filter(Grant.target_sectors.ilike(f"%{sector}%"))
+        # Per-token prefix/contains lookup via the sector side-index tables;
+        # falls back to an ILIKE scan for patterns the index cannot serve
+        criterion = sector_index_criterion(sector)
+        if criterion is not None:
+            query = query.filter(criterion)
+        else:
+            query = apply_text_filter(query, Grant.target_sectors_lc, sector, lowered=True)
     if country:
         query = query.filter(
-            (Grant.country.ilike(f"%{country}%")) |
-            (Grant.geographic_scope.ilike(f"%{country}%"))
+            like_criterion(Grant.country_lc, country, lowered=True) |
+            like_criterion(Grant.geographic_scope_lc, country, lowered=True)
         )
+    if contains:
+        # Unanchored substring search; served by the pg_trgm GIN index on
+        # PostgreSQL (see migrations/add_pattern_indexes.py), plain ILIKE on SQLite
+        query = query.filter(Grant.target_sectors.ilike(f"%{contains}%"))
     if repayment_required is not None:
         query = query.filter(Grant.repayment_required == repayment_required)
     if min_amount is not None:
@@ -60,14 +112,17 @@ def list_grants(
     if verified is not None:
         query = query.filter(Grant.verified == verified)
 
-    grants = query.offset(skip).limit(limit).all()
-    return grants
+    query = query.offset(skip).limit(limit).execution_options(yield_per=200)
+    return serialize_rows([
+        GrantResponse.model_construct(**row._mapping)
+        for row in db.execute(query)
+    ])
 
 
 @router.get("/grants/{grant_id}", response_model=GrantResponse)
 def get_grant(grant_id: int, db: Session = Depends(get_db)):
     """Get detailed grant information"""
-    grant = db.query(Grant).filter(Grant.id == grant_id).first()
+    grant = db.get(Grant, grant_id)
     if not grant:
         raise HTTPException(status_code=404, detail=f"Grant {grant_id} not found")
     return grant
@@ -83,17 +138,20 @@ def list_companies(
     db: Session = Depends(get_db)
 ):
     """List companies with filtering"""
-    query = db.query(Company)
+    query = select(*COMPANY_RESPONSE_COLS)
 
     if sector:
-        query = query.filter(Company.sector.ilike(f"%{sector}%"))
+        query = apply_text_filter(query, Company.sector_lc, sector, lowered=True)
     if nationality:
-        query = query.filter(Company.nationality.ilike(f"%{nationality}%"))
+        query = apply_text_filter(query, Company.nationality_lc, nationality, lowered=True)
     if business_stage:
-        query = query.filter(Company.business_stage.ilike(f"%{business_stage}%"))
+        query = apply_text_filter(query, Company.business_stage_lc, business_stage, lowered=True)
 
-    companies = query.offset(skip).limit(limit).all()
-    return companies
+    query = query.offset(skip).limit(limit).execution_options(yield_per=200)
+    return serialize_rows([
+        CompanyResponse.model_construct(**row._mapping)
+        for row in db.execute(query)
+    ])
 
 
 @router.post("/companies", response_model=CompanyResponse, status_code=201)
@@ -107,20 +165,33 @@ def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/match/{company_id}", response_model=MatchResponse)
-def match_company_with_grants(
+async def match_company_with_grants(
     company_id: int,
     top_n: int = Query(5, ge=1, le=20, description="Number of top matches"),
+    geo_prefilter: bool = Query(
+        False,
+        description="Restrict candidates to grants with geographic overlap "
+                    "before ranking (faster on large corpora, but can drop "
+                    "matches that score above threshold on sector/amount alone)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
-    Run ImaraFund's intelligent matching algorithm with AI recommendations
+    Run ImaraFund's intelligent matching algorithm
     Uses your proven 40/30/20/10 scoring system
+
+    Matches are returned immediately; the AI recommendation is served
+    separately by GET /match/{company_id}/ai/{grant_id} so this response
+    never waits on Gemini
     """
     matcher = IntelligentMatcher(db)
-    ai_service = GeminiService()
 
     try:
-        company, matches = matcher.find_matches(company_id, top_n=top_n)
+        # CPU + DB heavy - run in the threadpool so the event loop stays free
+        company, matches = await run_in_threadpool(
+            matcher.find_matches, company_id, top_n=top_n,
+            geo_prefilter=geo_prefilter
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -134,6 +205,14 @@ def match_company_with_grants(
             total_matches_found=0
         )
 
+    # Load the top grants in one batched query so serializing each
+    # GrantResponse below never triggers a per-match lazy load (N+1)
+    top_ids = [match['grant_id'] for match in matches]
+    top_grants = await run_in_threadpool(
+        lambda: db.scalars(select(Grant).where(Grant.id.in_(top_ids))).all()
+    )
+    grants_by_id = {grant.id: grant for grant in top_grants}
+
     # Process matches for API response
     match_results = []
     for match in matches:
@@ -155,44 +234,63 @@ def match_company_with_grants(
             website=match['website'],
             data_source_url=match['data_source_url'],
             repayment_required=match['repayment_required'],
-            grant_details=GrantResponse.from_orm(match['grant'])
+            grant_details=GrantResponse.from_orm(grants_by_id[match['grant_id']])
         )
         match_results.append(match_result)
 
-    # Generate AI recommendation for top match
-    company_profile = matcher.get_company_profile_dict(company)
-    ai_recommendation = ai_service.get_ai_recommendation(company_profile, matches[0])
-
+    top_grant_id = matches[0]['grant_id']
     return MatchResponse(
         company=CompanyResponse.from_orm(company),
         matches=match_results,
-        ai_recommendation=ai_recommendation,
+        ai_recommendation=(
+            f"Stream the AI recommendation from "
+            f"GET /api/v1/match/{company_id}/ai/{top_grant_id}"
+        ),
         total_matches_found=len(matches)
     )
-@router.get("/grants/{grant_id}", response_model=GrantResponse)
-def get_grant(grant_id: int, db: Session = Depends(get_db)):
-    grant = db.query(Grant).filter(Grant.id == grant_id).first()
-    if not grant:
-        raise HTTPException(status_code=404, detail=f"Grant {grant_id} not found")
-    return grant
 
 
-# 👇 PASTE IT RIGHT HERE 👇
 @router.post("/grants", response_model=GrantResponse, status_code=201)
-def create_grant(grant: GrantResponse, db: Session = Depends(get_db)):
-    """
-    Create a new grant manually (for seeding production)
-    """
+def create_grant(grant: GrantCreate, db: Session = Depends(get_db)):
+    """Create a new grant manually (for seeding production)"""
     db_grant = Grant(**grant.dict())
     db.add(db_grant)
     db.commit()
     db.refresh(db_grant)
     return db_grant
 
-@router.post("/grants", response_model=GrantResponse, status_code=201)
-def create_grant(grant: GrantCreate, db: Session = Depends(get_db)):
-    db_grant = Grant(**grant.dict())
-    db.add(db_grant)
-    db.commit()
-    db.refresh(db_grant)
-    return db_grant
\ No newline at end of file
+
+@router.get("/match/{company_id}/ai/{grant_id}")
+async def stream_match_recommendation(
+    company_id: int,
+    grant_id: int,
+    db: Session = Depends(get_db),
+    ai_service: GeminiService = Depends(get_gemini_service)
+):
+    """
+    Stream the Gemini recommendation for one company/grant match
+
+    Decoupled from /match so match retrieval never blocks on the LLM;
+    repeated requests replay from the 24h recommendation cache
+    """
+    matcher = IntelligentMatcher(db)
+
+    try:
+        company, matches = await run_in_threadpool(
+            matcher.find_matches, company_id, top_n=20
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    match = next((m for m in matches if m['grant_id'] == grant_id), None)
+    if not match:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Grant {grant_id} is not a match for company {company_id}"
+        )
+
+    company_profile = matcher.get_company_profile_dict(company)
+    return StreamingResponse(
+        ai_service.stream_ai_recommendation(company_id, grant_id, company_profile, match),
+        media_type="text/plain"
+    )
\ No newline at end of file
@@ -3,7 +3,7 @@ ImaraFund Database Configuration
 SQLAlchemy setup optimized for the matching algorithm
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -17,9 +17,24 @@ engine = create_engine(
     settings.DATABASE_URL,
     connect_args=connect_args,
     echo=settings.DEBUG,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    # Room for every distinct statement shape the API emits (default 500);
+    # cached compilations skip the SQL-construction step per request
+    query_cache_size=1200,
 )
 
+if engine.url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune SQLite for the read-heavy matching workload"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")        # concurrent reads with writes
+        cursor.execute("PRAGMA synchronous=NORMAL")      # safe with WAL, far fewer fsyncs
+        cursor.execute("PRAGMA cache_size=-65536")       # 64MB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")     # 256MB memory-mapped I/O
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
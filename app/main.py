@@ -5,9 +5,21 @@ FastAPI app with CORS, startup events, and API routing
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+from sqlalchemy import select
+
 from app.core.config import settings
-from app.database import init_db
+from app.database import init_db, SessionLocal
 from app.api.endpoints import router
+from app.services import scoring_numba
+from app.services.gemini_service import get_gemini_service
+from app.services.grant_cache import grant_cache
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -15,7 +27,8 @@ app = FastAPI(
     description="AI-powered matching platform for African SME funding",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=DefaultResponse
 )
 
 # Configure CORS middleware
@@ -33,8 +46,22 @@ app.include_router(router, prefix=settings.API_V1_PREFIX)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on application startup"""
+    """
+    Initialize database and pre-warm everything the first request would
+    otherwise pay for: JIT compilation, the DB connection pool, the Gemini
+    SDK setup and the grant feature cache
+    """
     init_db()
+    scoring_numba.warmup()  # compile the JIT scoring kernel before traffic
+    get_gemini_service()    # configure the Gemini SDK off the request path
+
+    db = SessionLocal()
+    try:
+        db.execute(select(1))  # prime the connection pool
+        grant_cache.warm(db)   # pre-build the scoring feature arrays
+    finally:
+        db.close()
+
     print("🚀 ImaraFund API started successfully!")
 
 
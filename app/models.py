@@ -3,8 +3,8 @@ ImaraFund Database Models
 Optimized for 63-column grants CSV and IntelligentMatcher algorithm
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Computed, Integer, String, Float, Boolean, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func, text
 from app.database import Base
 
 
@@ -29,6 +29,11 @@ class Grant(Base):
     region = Column(String(200), index=True)
     geographic_scope = Column(String(200), index=True)
 
+    # Materialized lowercase copies so the text filters hit a plain
+    # pattern-ops btree without computing lower() at query time
+    country_lc = Column(String(200), Computed("lower(country)", persisted=True))
+    geographic_scope_lc = Column(String(200), Computed("lower(geographic_scope)", persisted=True))
+
     # Financial Fields (CRITICAL for 20% funding scoring)
     currency_code = Column(String(10))
     estimated_value_amount = Column(Float)
@@ -40,6 +45,7 @@ class Grant(Base):
     # Sector Fields (CRITICAL for 30% sector scoring)
     program_type = Column(String(200))
     target_sectors = Column(Text, index=True)
+    target_sectors_lc = Column(Text, Computed("lower(target_sectors)", persisted=True))
 
     # Business Requirements
     duration_months = Column(Integer)
@@ -71,9 +77,9 @@ class Grant(Base):
     innovation_focus = Column(Boolean, default=False)
     digital_focus = Column(Boolean, default=False)
     export_focus = Column(Boolean, default=False)
-    women_focused = Column(Boolean, default=False, index=True)
-    youth_focused = Column(Boolean, default=False, index=True)
-    agriculture_focused = Column(Boolean, default=False, index=True)
+    women_focused = Column(Boolean, default=False)
+    youth_focused = Column(Boolean, default=False)
+    agriculture_focused = Column(Boolean, default=False)
     green_climate_focused = Column(Boolean, default=False)
 
     # Support Services
@@ -100,7 +106,7 @@ class Grant(Base):
     program_start_date = Column(String(100))
 
     # Status and Verification
-    verified = Column(Boolean, default=False, index=True)
+    verified = Column(Boolean, default=False)
     last_verified_date = Column(String(50))
     last_updated = Column(String(50))
     verification_date = Column(String(50))
@@ -118,6 +124,51 @@ class Grant(Base):
         return f"<Grant(id={self.id}, name='{self.program_name}')>"
 
 
+# Partial composite indexes for the boolean-focus filters. Full-column btrees
+# on skewed booleans are near-useless; indexing only the TRUE-and-verified
+# subset (with the columns the filters combine with) keeps them small and
+# selective. SQLite and PostgreSQL both support the WHERE clause.
+Index(
+    "ix_grants_women_verified",
+    Grant.country, Grant.target_sectors,
+    postgresql_where=text("women_focused AND verified"),
+    sqlite_where=text("women_focused AND verified"),
+)
+Index(
+    "ix_grants_youth_verified",
+    Grant.country, Grant.target_sectors,
+    postgresql_where=text("youth_focused AND verified"),
+    sqlite_where=text("youth_focused AND verified"),
+)
+Index(
+    "ix_grants_agriculture_verified",
+    Grant.country, Grant.target_sectors,
+    postgresql_where=text("agriculture_focused AND verified"),
+    sqlite_where=text("agriculture_focused AND verified"),
+)
+
+
+
+# Pattern-ops btrees over the materialized lowercase columns. These serve the
+# anchored prefix LIKE filters in list_grants without evaluating lower() at
+# index or query time (on SQLite they are plain indexes, same plan win).
+Index(
+    "ix_grants_country_lc_pat",
+    Grant.country_lc,
+    postgresql_ops={"country_lc": "text_pattern_ops"},
+)
+Index(
+    "ix_grants_geographic_scope_lc_pat",
+    Grant.geographic_scope_lc,
+    postgresql_ops={"geographic_scope_lc": "text_pattern_ops"},
+)
+Index(
+    "ix_grants_target_sectors_lc_pat",
+    Grant.target_sectors_lc,
+    postgresql_ops={"target_sectors_lc": "text_pattern_ops"},
+)
+
+
 class Company(Base):
     """
     Company model matching your synthetic companies dataset structure
@@ -142,6 +193,11 @@ class Company(Base):
     nationality = Column(String(100), nullable=False, index=True)
     business_registered_in = Column(String(100))
 
+    # Materialized lowercase copies for the list_companies text filters
+    sector_lc = Column(String(200), Computed("lower(sector)", persisted=True))
+    nationality_lc = Column(String(100), Computed("lower(nationality)", persisted=True))
+    business_stage_lc = Column(String(100), Computed("lower(business_stage)", persisted=True))
+
     # Founder Demographics
     founder_age = Column(Integer)
     founder_gender = Column(String(20))
@@ -162,4 +218,79 @@ class Company(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
-        return f"<Company(id={self.id}, name='{self.company_name}')>"
\ No newline at end of file
+        return f"<Company(id={self.id}, name='{self.company_name}')>"
+
+
+class GrantSector(Base):
+    """
+    Normalized one-row-per-sector view of Grant.target_sectors
+    Exact sector filters become an indexed equality probe here instead of a
+    substring scan over the delimited TEXT column. Kept in sync by the same
+    ORM events that maintain the prefix/suffix side-indexes.
+    """
+
+    __tablename__ = "grant_sectors"
+
+    id = Column(Integer, primary_key=True)
+    grant_id = Column(Integer, index=True, nullable=False)
+    sector = Column(String(200), index=True, nullable=False)
+
+
+class GrantSectorPrefix(Base):
+    """
+    Prefix side-index over the individual target_sectors values of a grant
+    One row per (grant, sector-token prefix); serves prefix/exact sector
+    filters with an index scan instead of scanning the whole TEXT column
+    """
+
+    __tablename__ = "grant_sector_prefixes"
+
+    id = Column(Integer, primary_key=True)
+    grant_id = Column(Integer, index=True, nullable=False)
+    prefix = Column(String(15), nullable=False)
+
+
+Index(
+    "ix_grant_sector_prefixes_prefix_pat",
+    GrantSectorPrefix.prefix,
+    postgresql_ops={"prefix": "text_pattern_ops"},
+)
+
+
+class GrantSectorSuffix(Base):
+    """
+    Suffix side-index over the individual target_sectors values of a grant
+    A substring query q matches a token iff some suffix of the token starts
+    with q, so contains-filters become prefix scans over this table
+    """
+
+    __tablename__ = "grant_sector_suffixes"
+
+    id = Column(Integer, primary_key=True)
+    grant_id = Column(Integer, index=True, nullable=False)
+    suffix = Column(String(15), nullable=False)
+
+
+Index(
+    "ix_grant_sector_suffixes_suffix_pat",
+    GrantSectorSuffix.suffix,
+    postgresql_ops={"suffix": "text_pattern_ops"},
+)
+
+
+# Same pattern-ops indexes for the list_companies filters
+Index(
+    "ix_companies_sector_lc_pat",
+    Company.sector_lc,
+    postgresql_ops={"sector_lc": "text_pattern_ops"},
+)
+Index(
+    "ix_companies_nationality_lc_pat",
+    Company.nationality_lc,
+    postgresql_ops={"nationality_lc": "text_pattern_ops"},
+)
+Index(
+    "ix_companies_business_stage_lc_pat",
+    Company.business_stage_lc,
+    postgresql_ops={"business_stage_lc": "text_pattern_ops"},
+)
\ No newline at end of file
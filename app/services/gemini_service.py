@@ -3,7 +3,13 @@ ImaraFund AI Recommendation Service
 Using your proven Gemini 2.5 Flash prompts and configuration
 """
 
-from typing import Dict
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from string import Template
+from typing import Dict, Iterator, Optional, Tuple
 import logging
 
 try:
@@ -17,6 +23,86 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Your exact prompt that works - preserved completely, compiled once at
+# import so each request does a single dict substitution instead of
+# re-evaluating a ~1KB f-string
+_PROMPT_TMPL = Template("""You are a friendly business advisor helping someone who is NOT a finance expert.
+
+COMPANY:
+- Business: ${company_name}
+- What they do: ${sector}
+- Location: ${nationality}
+- Stage: ${business_stage}
+- Money needed: $$${funding_need}
+
+FUNDING MATCH:
+- Program: ${program_name}
+- Institution: ${institution}
+- Amount: $$${funding_amount}
+- Match Score: ${match_score}/100
+
+Write advice using SIMPLE language that anyone can understand. Include these 4 sections:
+
+**WHY THIS WORKS:**
+Explain in 2-3 simple sentences why this funding fits their business. Use everyday words.
+
+**WHAT TO DO NEXT:**
+Give 3 specific actions they can take today. Use simple words like "create a budget" not "develop financial projections."
+
+**WATCH OUT FOR:**
+Mention 1-2 realistic challenges in plain English. Be honest but encouraging.
+
+**YOUR CHANCES:**
+Say "Excellent", "Good", "Fair", or "Challenging" and explain why in one sentence.
+
+Use everyday words. No jargon. Be encouraging but honest. Keep under 200 words.""")
+
+
+class _RecommendationCache:
+    """
+    Bounded LRU of generated recommendations with a TTL
+
+    Same treatment as the matcher's match-result cache: a size cap with
+    least-recently-used eviction, so a long-running process cannot
+    accumulate one entry per (company, grant, prompt) forever. Entries
+    past the TTL are deleted when they are next looked up.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 24 * 3600):
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self._ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), text)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_service() -> "GeminiService":
+    """
+    FastAPI dependency returning the process-wide GeminiService
+
+    Configuring google.generativeai and building the GenerativeModel is
+    expensive, so it happens once here instead of on every /match request.
+    """
+    return GeminiService()
+
 
 class GeminiService:
     """Your proven AI recommendation service using Gemini 2.5 Flash"""
@@ -41,42 +127,33 @@ class GeminiService:
         else:
             logger.info("ℹ️ AI disabled - Add GEMINI_API_KEY to .env")
 
+    # Generated recommendations cached per (company, match, prompt) for
+    # 24h, bounded so long-running processes do not grow without limit
+    CACHE_TTL_SECONDS = 24 * 3600
+    _recommendation_cache = _RecommendationCache(
+        maxsize=1024, ttl_seconds=CACHE_TTL_SECONDS
+    )
+
+    def _build_prompt(self, company_profile: Dict, match: Dict) -> str:
+        """Fill the precompiled prompt template (your exact prompt text)"""
+        return _PROMPT_TMPL.substitute(
+            company_name=company_profile.get('company_name', 'Startup'),
+            sector=company_profile.get('sector', 'Unknown'),
+            nationality=company_profile.get('nationality', 'Unknown'),
+            business_stage=company_profile.get('business_stage', 'Unknown'),
+            funding_need=f"{company_profile.get('funding_need_usd', 0):,}",
+            program_name=match['program_name'],
+            institution=match['institution'],
+            funding_amount=f"{match['funding_amount']:,}",
+            match_score=match['match_score'],
+        )
+
     def get_ai_recommendation(self, company_profile: Dict, match: Dict) -> str:
         """Generate clear, simple AI recommendation using your exact prompt"""
         if not self.ai_enabled:
             return "🔑 Add your Gemini API key to .env file to get AI-powered recommendations!"
 
-        # Your exact prompt that works - preserved completely
-        prompt = f"""You are a friendly business advisor helping someone who is NOT a finance expert.
-
-COMPANY:
-- Business: {company_profile.get('company_name', 'Startup')}
-- What they do: {company_profile.get('sector', 'Unknown')}
-- Location: {company_profile.get('nationality', 'Unknown')}
-- Stage: {company_profile.get('business_stage', 'Unknown')}
-- Money needed: ${company_profile.get('funding_need_usd', 0):,}
-
-FUNDING MATCH:
-- Program: {match['program_name']}
-- Institution: {match['institution']}
-- Amount: ${match['funding_amount']:,}
-- Match Score: {match['match_score']}/100
-
-Write advice using SIMPLE language that anyone can understand. Include these 4 sections:
-
-**WHY THIS WORKS:**
-Explain in 2-3 simple sentences why this funding fits their business. Use everyday words.
-
-**WHAT TO DO NEXT:**
-Give 3 specific actions they can take today. Use simple words like "create a budget" not "develop financial projections."
-
-**WATCH OUT FOR:**
-Mention 1-2 realistic challenges in plain English. Be honest but encouraging.
-
-**YOUR CHANCES:**
-Say "Excellent", "Good", "Fair", or "Challenging" and explain why in one sentence.
-
-Use everyday words. No jargon. Be encouraging but honest. Keep under 200 words."""
+        prompt = self._build_prompt(company_profile, match)
 
         try:
             response = self.model.generate_content(
@@ -99,4 +176,53 @@ Use everyday words. No jargon. Be encouraging but honest. Keep under 200 words."
             elif "404" in error_msg or "not found" in error_msg.lower():
                 return "⚠️ Model not available. Check your API key."
             else:
-                return f"⚠️ AI temporarily unavailable: {error_msg}"
\ No newline at end of file
+                return f"⚠️ AI temporarily unavailable: {error_msg}"
+
+    def _cache_key(self, company_id: int, grant_id: int, prompt: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+        return f"{company_id}:{grant_id}:{prompt_hash}"
+
+    def _cached_recommendation(self, key: str) -> Optional[str]:
+        return self._recommendation_cache.get(key)
+
+    def stream_ai_recommendation(self, company_id: int, grant_id: int,
+                                 company_profile: Dict, match: Dict) -> Iterator[str]:
+        """
+        Stream the AI recommendation as text chunks as Gemini produces them
+
+        Results are cached for 24h keyed by (company, grant, prompt), so
+        repeated requests for the same match replay instantly without
+        touching Gemini.
+        """
+        if not self.ai_enabled:
+            yield "🔑 Add your Gemini API key to .env file to get AI-powered recommendations!"
+            return
+
+        prompt = self._build_prompt(company_profile, match)
+        key = self._cache_key(company_id, grant_id, prompt)
+
+        cached = self._cached_recommendation(key)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    'temperature': 0.8,
+                    'top_p': 0.9,
+                    'max_output_tokens': 600,
+                },
+                stream=True
+            )
+            chunks = []
+            for chunk in response:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            self._recommendation_cache.put(key, "".join(chunks))
+
+        except Exception as e:
+            logger.error(f"ImaraFund Gemini AI streaming error: {str(e)}")
+            yield f"⚠️ AI temporarily unavailable: {str(e)}"
\ No newline at end of file
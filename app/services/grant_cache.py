@@ -0,0 +1,93 @@
+"""
+ImaraFund Grant Feature Cache
+Process-wide cache of the scoring feature arrays built from the grant corpus
+
+Grants change rarely but every /match request was re-querying and re-encoding
+the whole corpus. The cache keeps the Grant rows and their SoA feature arrays
+(see scoring_numba.build_grant_features) in memory, guarded by two staleness
+signals: a version counter bumped by ORM insert/update/delete events, and a
+cheap (count, max(updated_at)) probe that catches writes the events cannot
+see — bulk_insert_mappings in the migration scripts, or another worker
+sharing the database. The next request after a change lazily rebuilds.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models import Grant
+from app.services.scoring_numba import GrantFeatures, build_grant_features
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The only grant columns matching needs: scoring inputs plus the metadata
+# surfaced in match dicts. Loading Row tuples of these instead of full
+# ~60-column ORM objects skips identity-map and attribute hydration; the
+# API layer re-hydrates just the top-N grants for the response.
+SCORING_COLS = (
+    Grant.id, Grant.program_name, Grant.institution_name, Grant.country,
+    Grant.geographic_scope, Grant.target_sectors, Grant.estimated_value_amount,
+    Grant.website_url, Grant.data_source_url, Grant.repayment_required,
+)
+
+
+class GrantFeatureCache:
+    """Versioned cache of (grant rows, feature arrays) for the matcher"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._built_version = -1
+        self._grants: List[Row] = []
+        self._features: GrantFeatures = None
+        self._db_version: Optional[Tuple] = None
+
+    def invalidate(self):
+        """Mark the cached corpus stale (cheap; rebuild happens lazily)"""
+        with self._lock:
+            self._version += 1
+
+    def get(self, db: Session) -> Tuple[List[Row], GrantFeatures]:
+        """Return the cached corpus rows and features, rebuilding if stale"""
+        db_version = tuple(db.execute(
+            select(func.count(Grant.id), func.max(Grant.updated_at))
+        ).one())
+        with self._lock:
+            if self._built_version != self._version or self._db_version != db_version:
+                self._grants = db.execute(select(*SCORING_COLS)).all()
+                self._features = build_grant_features(self._grants)
+                self._built_version = self._version
+                self._db_version = db_version
+                logger.info(f"Grant feature cache rebuilt ({len(self._grants)} grants, "
+                            f"version {self._built_version})")
+            return self._grants, self._features
+
+    def corpus_key(self) -> Tuple:
+        """
+        Opaque identity of the currently built corpus
+
+        Changes whenever the cache rebuilds; downstream result caches (the
+        match cache in IntelligentMatcher) key on it so grant changes
+        invalidate them for free.
+        """
+        with self._lock:
+            return (self._built_version, self._db_version)
+
+    def warm(self, db: Session):
+        """Build the cache eagerly (called from the startup event)"""
+        self.get(db)
+
+
+grant_cache = GrantFeatureCache()
+
+
+@event.listens_for(Grant, "after_insert")
+@event.listens_for(Grant, "after_update")
+@event.listens_for(Grant, "after_delete")
+def _invalidate_on_grant_change(mapper, connection, grant):
+    grant_cache.invalidate()
@@ -3,13 +3,61 @@ ImaraFund Intelligent Matching Service
 Your exact IntelligentMatcher algorithm ported to SQLAlchemy
 """
 
-from typing import List, Tuple, Dict
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Dict
+import numpy as np
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models import Grant, Company
+from app.services import scoring_numba
+from app.services.grant_cache import grant_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+class _MatchResultCache:
+    """
+    Small process-level LRU of finished match lists
+
+    Keys carry the company id and updated_at, the request parameters and
+    the grant corpus key, so a repeated dashboard reload or retry returns
+    the stored top-N instead of re-scoring, while any grant or company
+    change produces a fresh key.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._maxsize = maxsize
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        with self._lock:
+            matches = self._data.get(key)
+            if matches is not None:
+                self._data.move_to_end(key)
+            return matches
+
+    def put(self, key: Tuple, matches: List[Dict]) -> None:
+        with self._lock:
+            self._data[key] = matches
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+_match_cache = _MatchResultCache()
+
+
+# Company columns surfaced to the AI service, in your original order
+_PROFILE_COLS = (
+    'company_name', 'sector', 'nationality', 'business_stage',
+    'funding_need_usd', 'founder_age', 'founder_gender',
+    'business_age_months', 'annual_revenue_usd', 'employees',
+)
+
 
 class IntelligentMatcher:
     """
@@ -17,72 +65,323 @@ class IntelligentMatcher:
     Preserves exact scoring logic: 40% Geography, 30% Sector, 20% Funding, 10% Stage
     """
 
+    # Your exact stage tiers as a lookup table: one hash probe replaces the
+    # old if/elif chain, with 7.0 for any unrecognized stage
+    STAGE_SCORES = {
+        'startup': 10.0, 'early growth': 10.0,
+        'idea': 8.0,
+        'growth': 9.0, 'scale-up': 9.0, 'expansion': 9.0,
+    }
+    STAGE_DEFAULT = 7.0
+
+    # Your exact Africa countries (regional scoring in _score_geography);
+    # frozenset so membership is a hash lookup instead of a linear scan
+    AFRICA_COUNTRIES = frozenset((
+        'nigeria', 'kenya', 'south africa', 'ghana', 'uganda', 'egypt',
+        'tanzania', 'rwanda', 'ethiopia', 'senegal', 'botswana', 'zambia',
+        'zimbabwe', 'morocco', 'tunisia', 'algeria', 'libya', 'cameroon',
+        'ivory coast', 'mali', 'burkina faso', 'niger', 'madagascar'
+    ))
+
     def __init__(self, db: Session):
         self.db = db
         logger.info("ImaraFund IntelligentMatcher initialized")
 
-    def find_matches(self, company_id: int, top_n: int = 5) -> Tuple[Company, List[Dict]]:
-        """Find best matching grants using your exact scoring algorithm"""
-        company = self.db.query(Company).filter(Company.id == company_id).first()
+    def find_matches(self, company_id: int, top_n: int = 5,
+                     geo_prefilter: bool = False) -> Tuple[Company, List[Dict]]:
+        """
+        Find best matching grants using your exact scoring algorithm
+
+        geo_prefilter=True restricts candidates to grants with some
+        geographic overlap via an indexed SQL query before ranking. A grant
+        with zero geography can still total 60 points (sector 30 + amount
+        20 + stage 10), so the prefilter can drop above-threshold results —
+        it stays opt-in for deployments that accept that trade for latency.
+        """
+        company = self.db.get(Company, company_id)
         if not company:
             raise ValueError(f"Company with ID {company_id} not found")
 
-        grants = self.db.query(Grant).all()
+        # Corpus and feature arrays come from the process-level cache;
+        # rebuilt lazily after any grant insert/update/delete
+        grants, features = grant_cache.get(self.db)
+
+        cache_key = (company_id, company.updated_at, top_n, geo_prefilter,
+                     grant_cache.corpus_key())
+        cached = _match_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Match cache hit for company {company.company_name}")
+            return company, cached
+
         logger.info(f"Processing {len(grants)} grants for company {company.company_name}")
 
-        matches = []
-        for grant in grants:
-            score, breakdown = self._calculate_match_score(company, grant)
-
-            if score > 30:  # Your threshold from the original script
-                matches.append({
-                    'grant': grant,
-                    'program_name': grant.program_name or 'Unknown Program',
-                    'institution': grant.institution_name or 'Unknown Institution',
-                    'country': grant.country or 'Unknown',
-                    'funding_amount': grant.estimated_value_amount or 0,
-                    'match_score': round(score, 1),
-                    'score_breakdown': breakdown,
-                    'target_sectors': grant.target_sectors or 'General',
-                    'website': grant.website_url or 'Not available',
-                    'data_source_url': grant.data_source_url or 'Not available',
-                    'repayment_required': str(grant.repayment_required) if grant.repayment_required is not None else 'Unknown'
-                })
-
-        matches_sorted = sorted(matches, key=lambda x: x['match_score'], reverse=True)[:top_n]
-        logger.info(f"Found {len(matches)} matches above threshold, returning top {len(matches_sorted)}")
+        if scoring_numba._NUMBA_AVAILABLE and grants:
+            scores, breakdowns = self._score_grants_jit(company, features)
+        else:
+            # NumPy fallback when numba is not installed
+            scores, breakdowns = self._score_grants_vectorized(company, features)
+
+        if geo_prefilter and grants:
+            candidate_ids = self._geo_candidate_ids(company)
+            if candidate_ids is not None:
+                scores = np.where(
+                    np.isin(features.grant_ids, candidate_ids), scores, 0.0
+                )
+        # Scoring keeps everything as arrays; match dicts (string defaults,
+        # rounding, breakdown dicts) are built only for the winners
+        top_idx = self._top_n_indices(scores, top_n)
+        matches_sorted = [
+            self._build_match(grants[i], float(scores[i]),
+                              self._breakdown_dict(breakdowns[i]))
+            for i in top_idx
+        ]
+
+        eligible = int(np.count_nonzero(scores > 30))
+        logger.info(f"Found {eligible} matches above threshold, returning top {len(matches_sorted)}")
+        _match_cache.put(cache_key, matches_sorted)
         return company, matches_sorted
 
+    def _geo_candidate_ids(self, company: Company) -> Optional[np.ndarray]:
+        """
+        Ids of grants with any geographic overlap with the company, queried
+        over the lowercase columns (served by the pg_trgm indexes from
+        migrations/add_geo_prefilter_indexes.py on PostgreSQL)
+
+        Returns None when the company has no nationality: an empty string
+        is contained in every grant country, so nothing could be excluded.
+        """
+        company_country = str(company.nationality or '').lower().strip()
+        if not company_country:
+            return None
+
+        conditions = [
+            Grant.geographic_scope_lc.like('%global%'),
+            Grant.country_lc.like(f'%{company_country}%'),
+            Grant.geographic_scope_lc.like(f'%{company_country}%'),
+        ]
+        if company_country in self.AFRICA_COUNTRIES:
+            conditions.append(Grant.geographic_scope_lc.like('%africa%'))
+
+        rows = self.db.execute(select(Grant.id).where(or_(*conditions)))
+        return np.fromiter((row[0] for row in rows), dtype=np.int64)
+
+    @staticmethod
+    def _top_n_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Indices of the top-N scores above the match threshold, best first
+
+        Uses argpartition (O(M) selection) instead of sorting every
+        above-threshold candidate, and is applied before any match dicts
+        are built so losing grants cost nothing beyond their score.
+        """
+        eligible = np.flatnonzero(scores > 30)  # Your threshold from the original script
+        if len(eligible) > top_n:
+            eligible = eligible[np.argpartition(-scores[eligible], top_n - 1)[:top_n]]
+        return eligible[np.argsort(-scores[eligible])]
+
+    def _build_match(self, grant, score: float, breakdown: Dict) -> Dict:
+        """
+        Build the match dict returned to the API layer
+
+        `grant` is a lean Row of the cached scoring columns (see
+        grant_cache.SCORING_COLS); callers needing full Grant objects
+        re-hydrate the top-N by id afterwards
+        """
+        return {
+            'grant': grant,
+            'grant_id': grant.id,
+            'program_name': grant.program_name or 'Unknown Program',
+            'institution': grant.institution_name or 'Unknown Institution',
+            'country': grant.country or 'Unknown',
+            'funding_amount': grant.estimated_value_amount or 0,
+            'match_score': round(score, 1),
+            'score_breakdown': breakdown,
+            'target_sectors': grant.target_sectors or 'General',
+            'website': grant.website_url or 'Not available',
+            'data_source_url': grant.data_source_url or 'Not available',
+            'repayment_required': str(grant.repayment_required) if grant.repayment_required is not None else 'Unknown'
+        }
+
+    @staticmethod
+    def _company_primitives(company: Company):
+        """
+        Normalize the company fields the scorers read, once per request
+
+        The company is constant over the grant loop, so lowering/stripping
+        its fields per grant only burns allocations
+        """
+        company_country = str(company.nationality or '').lower().strip()
+        company_sector = str(company.sector or '').lower().strip()
+        company_stage = str(company.business_stage or '').lower().strip()
+        need = float(company.funding_need_usd or 0.0)
+        sector_words = [w for w in company_sector.split() if len(w) > 3]
+        return company_country, company_sector, company_stage, need, sector_words
+
+    @staticmethod
+    def _breakdown_dict(breakdown_row: np.ndarray) -> Dict:
+        """Expand one (4,) breakdown row into the API's component dict"""
+        return {
+            'geographic': float(breakdown_row[0]),
+            'sector': float(breakdown_row[1]),
+            'amount_fit': float(breakdown_row[2]),
+            'stage': float(breakdown_row[3]),
+        }
+
+    def _score_grants_jit(self, company: Company,
+                          features: scoring_numba.GrantFeatures):
+        """
+        Score all grants through the numba kernel (same math as
+        _calculate_match_score, over structure-of-arrays features).
+        Returns (totals, breakdowns) arrays aligned with the corpus.
+        """
+        company_country, company_sector, company_stage, need, sector_words = \
+            self._company_primitives(company)
+        country_match, sector_exact, sector_partial, company_in_africa = \
+            self._company_feature_arrays(company_country, company_sector,
+                                         sector_words, features)
+        scope_flags, sector_flags = scoring_numba.pack_company_flags(
+            features, country_match, sector_exact, sector_partial
+        )
+
+        return scoring_numba.score_all(
+            scope_flags, sector_flags, company_in_africa,
+            features.amounts, need,
+            self._score_business_stage(company_stage),
+            settings.GEOGRAPHY_WEIGHT, settings.SECTOR_WEIGHT,
+            settings.FUNDING_WEIGHT, settings.STAGE_WEIGHT
+        )
+
+    def _company_feature_arrays(self, company_country: str, company_sector: str,
+                                sector_words: List[str],
+                                features: scoring_numba.GrantFeatures):
+        """
+        Compute the company-dependent containment features against a grant
+        corpus in one cheap pass (shared by the JIT and NumPy paths)
+        """
+        n = len(features.sectors)
+        country_match = np.fromiter(
+            (company_country in country or company_country in scope
+             for country, scope in zip(features.countries, features.scopes)),
+            dtype=np.bool_, count=n
+        )
+        sector_exact = np.fromiter(
+            (company_sector in sectors for sectors in features.sectors),
+            dtype=np.bool_, count=n
+        )
+        if sector_words:
+            # One compiled-alternation scan per grant instead of one `in`
+            # probe per company-sector word
+            words_re = re.compile('|'.join(re.escape(w) for w in sector_words))
+            sector_partial = np.fromiter(
+                (words_re.search(sectors) is not None for sectors in features.sectors),
+                dtype=np.bool_, count=n
+            )
+        else:
+            sector_partial = np.zeros(n, dtype=np.bool_)
+        return (country_match, sector_exact, sector_partial,
+                company_country in self.AFRICA_COUNTRIES)
+
+    def _score_grants_vectorized(self, company: Company,
+                                 features: scoring_numba.GrantFeatures):
+        """
+        Score all grants with boolean masks and np.where over the cached
+        feature arrays (no-numba path; same math as _calculate_match_score).
+        Returns (totals, breakdowns) arrays aligned with the corpus.
+        """
+        company_country, company_sector, company_stage, need, sector_words = \
+            self._company_primitives(company)
+        country_match, sector_exact, sector_partial, company_in_africa = \
+            self._company_feature_arrays(company_country, company_sector,
+                                         sector_words, features)
+
+        scope_global = (features.scope_flags & scoring_numba.SCOPE_GLOBAL) != 0
+        africa_scope = (features.scope_flags & scoring_numba.SCOPE_AFRICA) != 0
+        sector_open = (features.sector_flags & scoring_numba.SECTOR_OPEN) != 0
+
+        # Same weight-scaled tiers as scoring_numba.score_all, so the two
+        # paths agree when the Settings weights are changed from defaults
+        geo_full = 100.0 * settings.GEOGRAPHY_WEIGHT     # 40 at default weights
+        sec_full = 100.0 * settings.SECTOR_WEIGHT        # 30
+        amt_full = 100.0 * settings.FUNDING_WEIGHT       # 20
+
+        geo_scores = np.where(
+            scope_global | country_match, geo_full,
+            np.where(company_in_africa & africa_scope, geo_full * 35.0 / 40.0, 0.0)
+        )
+        sector_scores = np.where(
+            sector_open, sec_full * 25.0 / 30.0,
+            np.where(sector_exact, sec_full,
+                     np.where(sector_partial, sec_full * 20.0 / 30.0,
+                              sec_full * 10.0 / 30.0))
+        )
+        amount_scores = self._score_funding_amount_vec(need, features.amounts,
+                                                       amt_full)
+        stage_score = (self._score_business_stage(company_stage)
+                       * settings.STAGE_WEIGHT * 100.0 / 10.0)
+        totals = np.minimum(
+            100.0, geo_scores + sector_scores + amount_scores + stage_score
+        )
+        breakdowns = np.column_stack((
+            geo_scores, sector_scores, amount_scores,
+            np.full_like(totals, stage_score)
+        ))
+        return totals, breakdowns
+
+    @staticmethod
+    def _score_funding_amount_vec(need: float, available: np.ndarray,
+                                  amt_full: float) -> np.ndarray:
+        """
+        Vectorized _score_funding_amount over an (N,) amounts array, with
+        the 20/15/8 tiers scaled to the configured funding weight
+        """
+        amt_good = amt_full * 15.0 / 20.0
+        scores = np.full(available.shape, amt_full * 8.0 / 20.0)  # poor fit
+        ratio = np.divide(
+            need, available,
+            out=np.zeros_like(available), where=available != 0
+        )
+        scores[(ratio >= 0.05) & (ratio <= 5.0)] = amt_good   # good fit
+        scores[(ratio >= 0.1) & (ratio <= 2.0)] = amt_full    # perfect fit
+        scores[(available == 0) | (need == 0)] = amt_good     # unknown amounts
+        return scores
+
     def _calculate_match_score(self, company: Company, grant: Grant) -> Tuple[float, Dict]:
-        """Your exact scoring algorithm (0-100 points)"""
+        """
+        Your exact scoring algorithm (0-100 points)
+
+        Thin wrapper kept for one-off scoring; batch paths normalize the
+        company once via _company_primitives instead of per grant
+        """
+        company_country, company_sector, company_stage, need, sector_words = \
+            self._company_primitives(company)
+
         score = 0.0
         breakdown = {}
 
         # 1. Geographic Match (40 points) - Most important
-        geo_score = self._score_geography(company, grant)
+        geo_score = self._score_geography(company_country, grant)
         score += geo_score
         breakdown['geographic'] = geo_score
 
         # 2. Sector Match (30 points)
-        sector_score = self._score_sector(company, grant)
+        sector_score = self._score_sector(company_sector, sector_words, grant)
         score += sector_score
         breakdown['sector'] = sector_score
 
         # 3. Funding Amount Fit (20 points)
-        amount_score = self._score_funding_amount(company, grant)
+        amount_score = self._score_funding_amount(need, grant)
         score += amount_score
         breakdown['amount_fit'] = amount_score
 
         # 4. Stage Bonus (10 points)
-        stage_score = self._score_business_stage(company, grant)
+        stage_score = self._score_business_stage(company_stage)
         score += stage_score
         breakdown['stage'] = stage_score
 
         return min(100.0, score), breakdown
 
-    def _score_geography(self, company: Company, grant: Grant) -> float:
+    def _score_geography(self, company_country: str, grant: Grant) -> float:
         """Score geographic eligibility (0-40 points) - Your exact logic"""
-        company_country = str(company.nationality or '').lower().strip()
         grant_scope = str(grant.geographic_scope or '').lower().strip()
         grant_country = str(grant.country or '').lower().strip()
 
@@ -95,26 +394,19 @@ class IntelligentMatcher:
             return 40.0
 
         # Regional matches - Your exact Africa countries list
-        africa_countries = [
-            'nigeria', 'kenya', 'south africa', 'ghana', 'uganda', 'egypt',
-            'tanzania', 'rwanda', 'ethiopia', 'senegal', 'botswana', 'zambia',
-            'zimbabwe', 'morocco', 'tunisia', 'algeria', 'libya', 'cameroon',
-            'ivory coast', 'mali', 'burkina faso', 'niger', 'madagascar'
-        ]
-
-        if company_country in africa_countries:
+        if company_country in self.AFRICA_COUNTRIES:
             if 'africa' in grant_scope or 'african' in grant_scope:
                 return 35.0
 
         return 0.0
 
-    def _score_sector(self, company: Company, grant: Grant) -> float:
+    def _score_sector(self, company_sector: str, sector_words: List[str],
+                      grant: Grant) -> float:
         """Score sector alignment (0-30 points) - Your exact logic"""
-        company_sector = str(company.sector or '').lower().strip()
         target_sectors = str(grant.target_sectors or '').lower().strip()
 
         # All sectors accepted
-        if any(keyword in target_sectors for keyword in ['all', 'general', 'any']):
+        if any(keyword in target_sectors for keyword in scoring_numba.OPEN_SECTOR_KEYWORDS):
             return 25.0
 
         # Exact sector match
@@ -122,15 +414,13 @@ class IntelligentMatcher:
             return 30.0
 
         # Partial match (e.g., "tech" in "technology") - Your logic
-        sector_words = company_sector.split()
-        if any(word in target_sectors for word in sector_words if len(word) > 3):
+        if any(word in target_sectors for word in sector_words):
             return 20.0
 
         return 10.0
 
-    def _score_funding_amount(self, company: Company, grant: Grant) -> float:
+    def _score_funding_amount(self, need: float, grant: Grant) -> float:
         """Score funding amount fit (0-20 points) - Your exact logic"""
-        need = company.funding_need_usd or 0.0
         available = grant.estimated_value_amount or 0.0
 
         if available == 0 or need == 0:
@@ -150,31 +440,19 @@ class IntelligentMatcher:
         else:
             return 8.0
 
-    def _score_business_stage(self, company: Company, grant: Grant) -> float:
+    def _score_business_stage(self, stage: str) -> float:
         """Score business stage fit (0-10 points) - Your exact logic"""
-        stage = str(company.business_stage or '').lower().strip()
-
         # Most grants are flexible on stage - your comment
-        if stage in ['startup', 'early growth']:
-            return 10.0
-        elif stage == 'idea':
-            return 8.0
-        elif stage in ['growth', 'scale-up', 'expansion']:
-            return 9.0
-        else:
-            return 7.0
+        return self.STAGE_SCORES.get(stage, self.STAGE_DEFAULT)
 
     def get_company_profile_dict(self, company: Company) -> Dict:
         """Convert Company model to dict for AI service - matches your format"""
-        return {
-            'company_name': company.company_name,
-            'sector': company.sector,
-            'nationality': company.nationality,
-            'business_stage': company.business_stage,
-            'funding_need_usd': company.funding_need_usd,
-            'founder_age': company.founder_age,
-            'founder_gender': company.founder_gender,
-            'business_age_months': company.business_age_months,
-            'annual_revenue_usd': company.annual_revenue_usd,
-            'employees': company.employees
-        }
\ No newline at end of file
+        # Loaded attributes sit in the instance __dict__; reading them there
+        # skips the InstrumentedAttribute descriptor per field. An expired
+        # instance (e.g. right after a commit) has an empty __dict__, so
+        # touch one attribute first to trigger the normal refresh.
+        state = company.__dict__
+        if 'company_name' not in state:
+            _ = company.company_name
+            state = company.__dict__
+        return {col: state.get(col) for col in _PROFILE_COLS}
\ No newline at end of file
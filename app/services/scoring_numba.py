@@ -0,0 +1,195 @@
+"""
+ImaraFund JIT Scoring Kernel
+Numba-compiled inner loop for the 40/30/20/10 matching algorithm
+
+The per-grant scoring work is split in two: string containment checks are
+reduced to uint8 bitflag/float structure-of-arrays features (built once per
+grant corpus, plus a thin per-company pass), and the branchy arithmetic runs
+in a single @njit(parallel=True) kernel with prange over those arrays. When
+numba is not installed the kernel runs as plain Python and
+IntelligentMatcher uses its vectorized NumPy path instead.
+"""
+
+import logging
+import re
+from typing import List, NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    prange = range
+    logger.info("numba not installed - JIT scoring disabled, using Python scoring loop")
+
+# Keywords marking a grant as open to all sectors (25-point tier); shared
+# with IntelligentMatcher._score_sector so the two paths cannot drift
+OPEN_SECTOR_KEYWORDS = ('all', 'general', 'any')
+
+# Precompiled keyword scanners: one pass over each string instead of one
+# `in` probe per keyword. 'african' contains 'africa', so a single
+# 'africa' needle covers both legacy checks.
+_SCOPE_RE = re.compile(r'global|africa')
+_OPEN_RE = re.compile('|'.join(map(re.escape, OPEN_SECTOR_KEYWORDS)))
+
+# Bit positions in the uint8 flag arrays. The grant-side bits are set once
+# when the corpus is encoded; the company-side bits are OR'd in per request
+SCOPE_GLOBAL = 1    # 'global' in geographic_scope
+SCOPE_AFRICA = 2    # 'africa'/'african' in geographic_scope
+SCOPE_COUNTRY = 4   # company country contained in grant country/scope
+SECTOR_OPEN = 1     # OPEN_SECTOR_KEYWORDS hit in target_sectors
+SECTOR_EXACT = 2    # company sector contained in target_sectors
+SECTOR_PARTIAL = 4  # any long company-sector word in target_sectors
+
+
+class GrantFeatures(NamedTuple):
+    """Company-independent SoA view of a grant corpus for the scoring kernel"""
+    grant_ids: np.ndarray        # int64, Grant.id per row
+    scope_flags: np.ndarray      # uint8, SCOPE_GLOBAL | SCOPE_AFRICA bits
+    sector_flags: np.ndarray     # uint8, SECTOR_OPEN bit
+    amounts: np.ndarray          # float64, estimated_value_amount (0 = unknown)
+    countries: List[str]         # lowered country strings for containment checks
+    scopes: List[str]            # lowered geographic_scope strings
+    sectors: List[str]           # lowered target_sectors strings
+
+
+def build_grant_features(grants) -> GrantFeatures:
+    """Encode a list of Grant rows into the SoA arrays the kernel consumes"""
+    n = len(grants)
+    grant_ids = np.empty(n, dtype=np.int64)
+    scope_flags = np.zeros(n, dtype=np.uint8)
+    sector_flags = np.zeros(n, dtype=np.uint8)
+    amounts = np.empty(n, dtype=np.float64)
+    countries = []
+    scopes = []
+    sectors = []
+
+    for i, grant in enumerate(grants):
+        country = str(grant.country or '').lower().strip()
+        scope = str(grant.geographic_scope or '').lower().strip()
+        target_sectors = str(grant.target_sectors or '').lower().strip()
+
+        grant_ids[i] = grant.id
+        for hit in _SCOPE_RE.findall(scope):
+            scope_flags[i] |= SCOPE_GLOBAL if hit == 'global' else SCOPE_AFRICA
+        if _OPEN_RE.search(target_sectors):
+            sector_flags[i] |= SECTOR_OPEN
+        amounts[i] = grant.estimated_value_amount or 0.0
+        countries.append(country)
+        scopes.append(scope)
+        sectors.append(target_sectors)
+
+    return GrantFeatures(
+        grant_ids=grant_ids,
+        scope_flags=scope_flags,
+        sector_flags=sector_flags,
+        amounts=amounts,
+        countries=countries,
+        scopes=scopes,
+        sectors=sectors,
+    )
+
+
+def pack_company_flags(features: GrantFeatures, country_match: np.ndarray,
+                       sector_exact: np.ndarray, sector_partial: np.ndarray):
+    """OR the per-company containment bits into the cached grant flags"""
+    scope_flags = features.scope_flags | np.where(country_match, SCOPE_COUNTRY, 0).astype(np.uint8)
+    sector_flags = (features.sector_flags
+                    | np.where(sector_exact, SECTOR_EXACT, 0).astype(np.uint8)
+                    | np.where(sector_partial, SECTOR_PARTIAL, 0).astype(np.uint8))
+    return scope_flags, sector_flags
+
+
+def score_all(scope_flags, sector_flags, company_in_africa,
+              amounts, need, stage_points,
+              w_geo, w_sector, w_funding, w_stage):
+    """
+    Score every grant against one company (kernel, JIT-compiled when available)
+
+    Consumes the packed uint8 flag arrays (grant bits from the cache plus
+    the company bits from pack_company_flags). Point tiers are the legacy
+    40/35, 30/25/20/10, 20/15/8 and stage values, scaled by the Settings
+    weights so the defaults reproduce the original algorithm exactly.
+    Returns (totals, breakdown) with breakdown columns
+    geographic/sector/amount_fit/stage.
+    """
+    n = amounts.shape[0]
+    totals = np.empty(n, dtype=np.float64)
+    breakdown = np.empty((n, 4), dtype=np.float64)
+
+    geo_full = 100.0 * w_geo                    # 40 at default weights
+    geo_region = geo_full * 35.0 / 40.0         # 35
+    sec_full = 100.0 * w_sector                 # 30
+    sec_open_pts = sec_full * 25.0 / 30.0       # 25
+    sec_partial_pts = sec_full * 20.0 / 30.0    # 20
+    sec_floor = sec_full * 10.0 / 30.0          # 10
+    amt_full = 100.0 * w_funding                # 20
+    amt_good = amt_full * 15.0 / 20.0           # 15
+    amt_poor = amt_full * 8.0 / 20.0            # 8
+    stage = stage_points * w_stage * 100.0 / 10.0
+
+    for i in prange(n):
+        # Geography (global scope or country containment beats regional)
+        sf = scope_flags[i]
+        if sf & (SCOPE_GLOBAL | SCOPE_COUNTRY):
+            geo = geo_full
+        elif company_in_africa and sf & SCOPE_AFRICA:
+            geo = geo_region
+        else:
+            geo = 0.0
+
+        # Sector ('all sectors' checked first, as in the original)
+        tf = sector_flags[i]
+        if tf & SECTOR_OPEN:
+            sec = sec_open_pts
+        elif tf & SECTOR_EXACT:
+            sec = sec_full
+        elif tf & SECTOR_PARTIAL:
+            sec = sec_partial_pts
+        else:
+            sec = sec_floor
+
+        # Funding amount fit
+        available = amounts[i]
+        if available == 0.0 or need == 0.0:
+            amt = amt_good
+        else:
+            ratio = need / available
+            if 0.1 <= ratio <= 2.0:
+                amt = amt_full
+            elif 0.05 <= ratio <= 5.0:
+                amt = amt_good
+            else:
+                amt = amt_poor
+
+        total = geo + sec + amt + stage
+        if total > 100.0:
+            total = 100.0
+
+        breakdown[i, 0] = geo
+        breakdown[i, 1] = sec
+        breakdown[i, 2] = amt
+        breakdown[i, 3] = stage
+        totals[i] = total
+
+    return totals, breakdown
+
+
+if _NUMBA_AVAILABLE:
+    score_all = njit(parallel=True, cache=True)(score_all)
+
+
+def warmup():
+    """Trigger JIT compilation at startup so the first match request is fast"""
+    if not _NUMBA_AVAILABLE:
+        return
+    one_u8 = np.zeros(1, dtype=np.uint8)
+    one_float = np.zeros(1, dtype=np.float64)
+    score_all(one_u8, one_u8, False,
+              one_float, 0.0, 10.0,
+              0.40, 0.30, 0.20, 0.10)
+    logger.info("✅ Numba scoring kernel compiled")
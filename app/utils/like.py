@@ -0,0 +1,75 @@
+"""
+ImaraFund LIKE Pattern Specialization
+Dispatch text filters to the cheapest SQL operator for the pattern shape
+
+Bare terms become equality, anchored patterns become prefix/suffix LIKE
+(both index-friendly), and only genuine substring or wildcard patterns fall
+back to ILIKE. This keeps exact-match lookups off the sequential-scan path.
+"""
+
+from typing import Tuple
+
+from sqlalchemy import func
+
+# Pattern kinds returned by compile_like
+EQ = "eq"
+PREFIX = "prefix"
+SUFFIX = "suffix"
+CONTAINS = "contains"
+WILDCARD = "wildcard"
+
+
+def compile_like(pat: str) -> Tuple[str, str]:
+    """
+    Classify a user-supplied filter term into a pattern kind plus its payload
+
+    Returns one of:
+        ("eq", "kenya")        - no wildcards, exact match
+        ("prefix", "ken")      - "ken%"
+        ("suffix", "ya")       - "%ya"
+        ("contains", "eny")    - "%eny%"
+        ("wildcard", "ken_a%") - anything with inner % or _
+    """
+    has_inner_wildcard = "_" in pat or "%" in pat.strip("%")
+    if has_inner_wildcard:
+        return WILDCARD, pat
+
+    if pat.startswith("%") and pat.endswith("%") and len(pat) > 1:
+        return CONTAINS, pat.strip("%")
+    if pat.endswith("%"):
+        return PREFIX, pat.rstrip("%")
+    if pat.startswith("%"):
+        return SUFFIX, pat.lstrip("%")
+    return EQ, pat
+
+
+def like_criterion(column, pat: str, lowered: bool = False):
+    """
+    Build the cheapest case-insensitive filter criterion for a pattern
+
+    Equality and prefix forms are served by the pattern indexes in models.py.
+    Pass lowered=True for the materialized *_lc columns, which are already
+    case-folded and skip the per-row lower()/ILIKE machinery entirely.
+    """
+    kind, value = compile_like(pat)
+    value_lc = value.lower()
+    base = column if lowered else func.lower(column)
+
+    if kind == EQ:
+        return base == value_lc
+    if kind == PREFIX:
+        return base.like(value_lc + "%")
+    if kind == SUFFIX:
+        return base.like("%" + value_lc)
+    if kind == CONTAINS:
+        if lowered:
+            return column.like("%" + value_lc + "%")
+        return column.ilike("%" + value + "%")
+    if lowered:
+        return column.like(pat.lower())
+    return column.ilike(pat)
+
+
+def apply_text_filter(query, column, pat: str, lowered: bool = False):
+    """Apply the specialized filter for a pattern to an ORM query"""
+    return query.filter(like_criterion(column, pat, lowered=lowered))
@@ -0,0 +1,123 @@
+"""
+ImaraFund Sector Side-Index Maintenance
+Keep grant_sector_prefixes/grant_sector_suffixes in sync with Grant rows
+
+target_sectors holds delimited sector names (pipe and semicolon in the
+cleaned datasets, comma in older sources), so substring filters on it
+cannot use a btree. Instead we store, per grant, the 15-char prefix of
+each sector token plus every token suffix (also capped at 15 chars). Prefix
+and exact sector filters become indexed prefix scans on the prefix table;
+contains filters become prefix scans on the suffix table.
+
+Rows are maintained automatically via SQLAlchemy insert/update events on
+Grant. For data imported before this index existed, run
+scripts/rebuild_sector_indexes.py once.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, exists
+
+from app.models import Grant, GrantSector, GrantSectorPrefix, GrantSectorSuffix
+from app.utils.like import CONTAINS, EQ, PREFIX, compile_like
+
+# Matches the db_name experiment in the prefix/suffix index literature;
+# queries longer than this fall back to an ILIKE scan
+VALUE_LENGTH = 15
+
+# Delimiters between sector names: the cleaned grant CSVs use | and ;,
+# older sources used commas
+_DELIMITERS_RE = re.compile(r"[|;,]")
+
+
+def sector_tokens(target_sectors: str) -> List[str]:
+    """Split a target_sectors value into normalized sector tokens"""
+    if not target_sectors:
+        return []
+    return [t.strip().lower()
+            for t in _DELIMITERS_RE.split(str(target_sectors)) if t.strip()]
+
+
+def build_index_rows(grant_id: int, target_sectors: str) -> Tuple[List[dict], List[dict], List[dict]]:
+    """Build the normalized sector, prefix and suffix rows for one grant"""
+    tokens = set(sector_tokens(target_sectors))
+    prefixes = set()
+    suffixes = set()
+    for token in tokens:
+        prefixes.add(token[:VALUE_LENGTH])
+        for i in range(len(token)):
+            suffixes.add(token[i:i + VALUE_LENGTH])
+
+    sector_rows = [{"grant_id": grant_id, "sector": t} for t in sorted(tokens)]
+    prefix_rows = [{"grant_id": grant_id, "prefix": p} for p in sorted(prefixes)]
+    suffix_rows = [{"grant_id": grant_id, "suffix": s} for s in sorted(suffixes)]
+    return sector_rows, prefix_rows, suffix_rows
+
+
+_SIDE_TABLES = (
+    GrantSector.__table__, GrantSectorPrefix.__table__, GrantSectorSuffix.__table__
+)
+
+
+def _sync_index_rows(connection, grant: Grant):
+    """Replace the side-index rows for a grant (used by the ORM events)"""
+    for table in _SIDE_TABLES:
+        connection.execute(table.delete().where(table.c.grant_id == grant.id))
+
+    row_sets = build_index_rows(grant.id, grant.target_sectors)
+    for table, rows in zip(_SIDE_TABLES, row_sets):
+        if rows:
+            connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Grant, "after_insert")
+def _grant_after_insert(mapper, connection, grant):
+    _sync_index_rows(connection, grant)
+
+
+@event.listens_for(Grant, "after_update")
+def _grant_after_update(mapper, connection, grant):
+    _sync_index_rows(connection, grant)
+
+
+@event.listens_for(Grant, "after_delete")
+def _grant_after_delete(mapper, connection, grant):
+    for table in _SIDE_TABLES:
+        connection.execute(table.delete().where(table.c.grant_id == grant.id))
+
+
+def sector_index_criterion(pat: str) -> Optional[object]:
+    """
+    Build an EXISTS criterion against the side-index for a sector filter
+
+    Exact terms probe the normalized grant_sectors table with an indexed
+    equality, prefix terms probe the prefix table, contains terms the suffix
+    table. Returns None when the pattern cannot be served (inner wildcards,
+    or terms longer than the indexed value length) so the caller can fall
+    back to an ILIKE scan on target_sectors.
+    """
+    kind, value = compile_like(pat)
+    value = value.lower()
+    if not value:
+        return None
+
+    if kind == EQ:
+        return exists().where(
+            (GrantSector.grant_id == Grant.id) & (GrantSector.sector == value)
+        )
+
+    if len(value) > VALUE_LENGTH:
+        return None
+
+    if kind == PREFIX:
+        return exists().where(
+            (GrantSectorPrefix.grant_id == Grant.id) &
+            GrantSectorPrefix.prefix.like(value + "%")
+        )
+    if kind == CONTAINS:
+        return exists().where(
+            (GrantSectorSuffix.grant_id == Grant.id) &
+            GrantSectorSuffix.suffix.like(value + "%")
+        )
+    return None
@@ -0,0 +1,58 @@
+"""
+ImaraFund Focus-Flag Index Migration
+Swap the skewed-boolean btrees for the partial composite indexes
+
+Base.metadata.create_all never alters existing tables, so on a database
+created before models.py declared ix_grants_women_verified et al. the
+partial indexes never materialize and the old single-column btrees on the
+boolean flags are never dropped. Run this once on such a database; new
+databases get the partial indexes from init_db.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import engine
+
+# Single-column btrees on the skewed boolean flags; near-useless for the
+# filters and superseded by the partial composites below
+DROP_INDEXES = (
+    "ix_grants_women_focused",
+    "ix_grants_youth_focused",
+    "ix_grants_agriculture_focused",
+    "ix_grants_verified",
+)
+
+# Mirrors the Index() declarations in models.py: only the TRUE-and-verified
+# subset is indexed, with the columns the filters combine with
+PARTIAL_INDEXES = [
+    ("ix_grants_women_verified", "women_focused AND verified"),
+    ("ix_grants_youth_verified", "youth_focused AND verified"),
+    ("ix_grants_agriculture_verified", "agriculture_focused AND verified"),
+]
+
+
+def create_focus_indexes():
+    """Drop the obsolete boolean btrees and create the partial indexes"""
+    with engine.begin() as conn:
+        for index_name in DROP_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            print(f"  ✓ Dropped {index_name} (superseded)")
+
+        for index_name, predicate in PARTIAL_INDEXES:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} "
+                f"ON grants (country, target_sectors) WHERE {predicate}"
+            ))
+            print(f"  ✓ Created {index_name}")
+
+    print("\n✅ Focus-flag indexes migrated successfully!")
+
+
+if __name__ == "__main__":
+    create_focus_indexes()
@@ -0,0 +1,51 @@
+"""
+ImaraFund Geographic Prefilter Index Migration
+Create trigram indexes behind the geo_prefilter option on /match
+
+The prefilter in IntelligentMatcher probes unanchored LIKE '%term%'
+patterns over country_lc/geographic_scope_lc, which only a pg_trgm GIN
+index can serve; on SQLite the query stays a scan. Also drops the earlier
+ix_grant_scope_country composite btree, which those patterns cannot use.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import engine
+
+TRGM_INDEXES = [
+    ("ix_grants_country_lc_trgm", "grants", "country_lc"),
+    ("ix_grants_geographic_scope_lc_trgm", "grants", "geographic_scope_lc"),
+]
+
+
+def create_geo_prefilter_indexes():
+    """Create the trigram indexes for the geographic prefilter"""
+    is_postgres = engine.dialect.name == "postgresql"
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_grant_scope_country"))
+        print("  ✓ Dropped ix_grant_scope_country (superseded)")
+
+        if is_postgres:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for index_name, table, column in TRGM_INDEXES:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} USING gin ({column} gin_trgm_ops)"
+                ))
+                print(f"  ✓ Created {index_name} (pg_trgm)")
+        else:
+            print("  ℹ SQLite detected - geo prefilter stays on table scans "
+                  "(no trigram index)")
+
+    print("\n✅ Geographic prefilter indexes migrated successfully!")
+
+
+if __name__ == "__main__":
+    create_geo_prefilter_indexes()
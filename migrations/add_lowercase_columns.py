@@ -0,0 +1,81 @@
+"""
+ImaraFund Lowercase Column Migration
+Add generated lower() columns and move the pattern indexes onto them
+
+Replaces the functional lower(col) indexes from add_pattern_indexes.py with
+materialized lowercase columns (STORED on PostgreSQL; VIRTUAL on SQLite,
+which cannot ADD a stored generated column) plus plain text_pattern_ops
+btrees, so filters no longer compute lower() at query time.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import engine
+
+LC_COLUMNS = [
+    ("grants", "country_lc", "country", "VARCHAR(200)"),
+    ("grants", "geographic_scope_lc", "geographic_scope", "VARCHAR(200)"),
+    ("grants", "target_sectors_lc", "target_sectors", "TEXT"),
+    ("companies", "sector_lc", "sector", "VARCHAR(200)"),
+    ("companies", "nationality_lc", "nationality", "VARCHAR(100)"),
+    ("companies", "business_stage_lc", "business_stage", "VARCHAR(100)"),
+]
+
+OLD_INDEXES = [
+    "ix_grants_country_lower_pat",
+    "ix_grants_geographic_scope_lower_pat",
+    "ix_grants_target_sectors_lower_pat",
+    "ix_companies_sector_lower_pat",
+    "ix_companies_nationality_lower_pat",
+    "ix_companies_business_stage_lower_pat",
+]
+
+
+def add_lowercase_columns():
+    """Add the generated lowercase columns and reindex the text filters"""
+    is_postgres = engine.dialect.name == "postgresql"
+    storage = "STORED" if is_postgres else "VIRTUAL"
+
+    with engine.begin() as conn:
+        for table, lc_col, source, col_type in LC_COLUMNS:
+            existing = [
+                row[1] if not is_postgres else row[0]
+                for row in (
+                    conn.execute(text(f"PRAGMA table_info({table})"))
+                    if not is_postgres else
+                    conn.execute(text(
+                        "SELECT column_name FROM information_schema.columns "
+                        f"WHERE table_name = '{table}'"
+                    ))
+                )
+            ]
+            if lc_col in existing:
+                print(f"  ℹ {table}.{lc_col} already exists")
+            else:
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN {lc_col} {col_type} "
+                    f"GENERATED ALWAYS AS (lower({source})) {storage}"
+                ))
+                print(f"  ✓ Added {table}.{lc_col}")
+
+            index_name = f"ix_{table}_{lc_col}_pat"
+            opclass = " text_pattern_ops" if is_postgres else ""
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({lc_col}{opclass})"
+            ))
+            print(f"  ✓ Created {index_name}")
+
+        for index_name in OLD_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    print("\n✅ Lowercase columns and indexes created successfully!")
+
+
+if __name__ == "__main__":
+    add_lowercase_columns()
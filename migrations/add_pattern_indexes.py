@@ -0,0 +1,64 @@
+"""
+ImaraFund Pattern-Matching Index Migration
+Create the LIKE-friendly indexes behind the list_grants/list_companies filters
+
+On PostgreSQL this builds lower(col) btrees with text_pattern_ops (serves the
+anchored prefix LIKE filters) plus a pg_trgm GIN index on target_sectors for
+the `contains=` substring filter. On SQLite the prefix indexes are created as
+plain expression indexes and the substring filter stays on ILIKE.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import engine
+
+PREFIX_INDEXES = [
+    ("ix_grants_country_lower_pat", "grants", "country"),
+    ("ix_grants_geographic_scope_lower_pat", "grants", "geographic_scope"),
+    ("ix_grants_target_sectors_lower_pat", "grants", "target_sectors"),
+    ("ix_companies_sector_lower_pat", "companies", "sector"),
+    ("ix_companies_nationality_lower_pat", "companies", "nationality"),
+    ("ix_companies_business_stage_lower_pat", "companies", "business_stage"),
+]
+
+
+def create_pattern_indexes():
+    """Create prefix and trigram indexes for the text filters"""
+    is_postgres = engine.dialect.name == "postgresql"
+
+    with engine.begin() as conn:
+        for index_name, table, column in PREFIX_INDEXES:
+            if is_postgres:
+                ddl = (
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} (lower({column}) text_pattern_ops)"
+                )
+            else:
+                ddl = (
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} (lower({column}))"
+                )
+            conn.execute(text(ddl))
+            print(f"  ✓ Created {index_name}")
+
+        if is_postgres:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_grants_target_sectors_trgm "
+                "ON grants USING gin (target_sectors gin_trgm_ops)"
+            ))
+            print("  ✓ Created ix_grants_target_sectors_trgm (pg_trgm)")
+        else:
+            print("  ℹ SQLite detected - substring filter keeps ILIKE (no trigram index)")
+
+    print("\n✅ Pattern-matching indexes created successfully!")
+
+
+if __name__ == "__main__":
+    create_pattern_indexes()
@@ -1,40 +1,36 @@
-import pandas as pd
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Grant
+"""
+ImaraFund Grant Loader
+Thin wrapper around the bulk importer in migrations/migration_script.py
+
+The previous standalone loader duplicated a subset of the migrator with
+per-row adds and no value cleaning; routing through ImaraFundMigrator
+gives this entry point the vectorized cleaning and batched inserts too.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from migrations.migration_script import ImaraFundMigrator
+from scripts.rebuild_sector_indexes import rebuild_sector_indexes
 
 CSV_PATH = "data/cleaned/grants_cleaned_latest.csv"  # adjust filename if needed
 
-def load_grants():
-    db: Session = SessionLocal()
-
-    df = pd.read_csv(CSV_PATH)
-
-    for _, row in df.iterrows():
-        grant = Grant(
-            program_id=row.get("program_id"),
-            program_name=row.get("program_name"),
-            institution_name=row.get("institution_name"),
-            country=row.get("country"),
-            region=row.get("region"),
-            geographic_scope=row.get("geographic_scope"),
-            target_sectors=row.get("target_sectors"),
-            estimated_value_amount=row.get("estimated_value_amount"),
-            repayment_required=row.get("repayment_required"),
-            website_url=row.get("website_url"),
-            data_source_url=row.get("data_source_url"),
-            women_focused=row.get("women_focused"),
-            youth_focused=row.get("youth_focused"),
-            agriculture_focused=row.get("agriculture_focused"),
-            verified=row.get("verified")
-        )
-
-        db.add(grant)
-
-    db.commit()
-    db.close()
+
+def load_grants(csv_path: str = CSV_PATH):
+    """Import grants from the cleaned CSV via the bulk migrator"""
+    with ImaraFundMigrator() as migrator:
+        results = migrator.import_cleaned_grants(csv_path)
+
+    # The bulk inserts bypass the ORM events that maintain the sector
+    # side-indexes; rebuild them so sector filters see the new grants
+    rebuild_sector_indexes()
 
     print("✅ Grants loaded successfully!")
+    return results
+
 
 if __name__ == "__main__":
-    load_grants()
\ No newline at end of file
+    load_grants()
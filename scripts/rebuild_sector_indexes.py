@@ -0,0 +1,59 @@
+"""
+ImaraFund Sector Side-Index Rebuild
+Backfill grant_sectors/grant_sector_prefixes/grant_sector_suffixes for
+existing grants
+
+New and updated grants are indexed automatically by the ORM events in
+app/utils/sector_index.py; run this once after bulk imports, after
+upgrading a database created before the side-index tables existed, or
+after a change to the sector tokenizer.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, init_db
+from app.models import Grant, GrantSector, GrantSectorPrefix, GrantSectorSuffix
+from app.utils.sector_index import build_index_rows
+
+
+def rebuild_sector_indexes():
+    """Rebuild the sector side-index tables from scratch"""
+    init_db()
+    db = SessionLocal()
+
+    try:
+        db.query(GrantSector).delete()
+        db.query(GrantSectorPrefix).delete()
+        db.query(GrantSectorSuffix).delete()
+
+        sector_rows = []
+        prefix_rows = []
+        suffix_rows = []
+        grants = db.query(Grant.id, Grant.target_sectors).all()
+        for grant_id, target_sectors in grants:
+            t_rows, p_rows, s_rows = build_index_rows(grant_id, target_sectors)
+            sector_rows.extend(t_rows)
+            prefix_rows.extend(p_rows)
+            suffix_rows.extend(s_rows)
+
+        if sector_rows:
+            db.bulk_insert_mappings(GrantSector, sector_rows)
+        if prefix_rows:
+            db.bulk_insert_mappings(GrantSectorPrefix, prefix_rows)
+        if suffix_rows:
+            db.bulk_insert_mappings(GrantSectorSuffix, suffix_rows)
+        db.commit()
+
+        print(f"✅ Indexed {len(grants)} grants "
+              f"({len(sector_rows)} sectors, {len(prefix_rows)} prefixes, "
+              f"{len(suffix_rows)} suffixes)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_sector_indexes()